@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the Physician Notetaker Flask service.
+Starts flask_app:app locally, drives /process and the /api/* routes with
+synthetic transcripts and reports throughput, latency, error rates and
+per-worker memory for each concurrency level.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Dict, List, Any, Optional
+
+# Routes exercised by the harness: (path, payload encoding)
+ENDPOINTS = [
+    ('/process', 'form'),
+    ('/api/medical-summary', 'json'),
+    ('/api/sentiment-intent', 'json'),
+    ('/api/soap-note', 'json'),
+]
+
+PATIENT_NAMES = ['Patel', 'Smith', 'Jones', 'Garcia', 'Nguyen', 'Brown', 'Khan', 'Lee']
+BODY_PARTS = ['ankle', 'knee', 'neck', 'back', 'wrist', 'shoulder', 'hip']
+ACTIVITIES = ['playing football', 'running', 'lifting boxes', 'cycling', 'hiking', 'driving']
+SYMPTOMS = ['pain', 'ache', 'sore', 'swollen', 'tender', 'stiff', 'numb', 'tingling', 'bruising']
+TREATMENTS = ['rest', 'ice', 'crutches', 'a brace', 'physiotherapy', 'ibuprofen', 'exercise']
+CONDITIONS = ['grade 2 sprain', 'strain', 'whiplash injury', 'fracture', 'sprain']
+FEELINGS = [
+    "I'm worried it won't heal properly.",
+    "That's good to know, thanks.",
+    "I'm a bit nervous about going back to work.",
+    "Okay, that makes sense.",
+    "I'm relieved it isn't worse.",
+]
+
+
+class TranscriptGenerator:
+    """
+    Generates synthetic physician-patient transcripts in the format expected by
+    PhysicianNotetaker.parse_transcript().
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def generate(self, exchanges: int) -> str:
+        """Generate a transcript with the given number of physician/patient exchanges."""
+        rng = self.rng
+        name = rng.choice(PATIENT_NAMES)
+        part = rng.choice(BODY_PARTS)
+        symptoms = rng.sample(SYMPTOMS, 2)
+        treatments = rng.sample(TREATMENTS, 2)
+        condition = rng.choice(CONDITIONS)
+        weeks = rng.randint(2, 8)
+
+        lines = [
+            f"Physician: Good morning, Mr. {name}. What brings you in today?",
+            f"Patient: I hurt my {part} while {rng.choice(ACTIVITIES)}, and it's still "
+            f"{symptoms[0]} and {symptoms[1]}.",
+            "Physician: Have you taken anything for the pain?",
+            f"Patient: Just {treatments[0]} so far. {rng.choice(FEELINGS)}",
+        ]
+        for _ in range(max(0, exchanges - 3)):
+            lines.append(f"Physician: Any {rng.choice(SYMPTOMS)} around the {part}?")
+            lines.append(f"Patient: A little, mostly in the morning. {rng.choice(FEELINGS)}")
+        lines += [
+            f"Physician: Your {part} is healing well. It looks like a {condition}. "
+            f"With {treatments[0]} and {treatments[1]}, you should recover fully "
+            f"in about {weeks} weeks.",
+            f"Patient: {rng.choice(FEELINGS)}",
+            "Physician: If anything worsens, come back in two weeks for a reassessment.",
+        ]
+        return '\n\n'.join(lines)
+
+    def mix(self, count: int, min_exchanges: int = 3, max_exchanges: int = 20) -> List[str]:
+        """Generate a pool of transcripts of varying length."""
+        return [
+            self.generate(self.rng.randint(min_exchanges, max_exchanges))
+            for _ in range(count)
+        ]
+
+
+def _free_port() -> int:
+    """Return an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server: str, workers: int, port: int, log: IO[bytes]) -> subprocess.Popen:
+    """
+    Start flask_app:app under gunicorn or the Werkzeug development server.
+    The server's stderr is written to log so boot failures can be reported.
+    """
+    if server == 'gunicorn':
+        cmd = [
+            sys.executable, '-m', 'gunicorn', 'flask_app:app',
+            '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+            '--log-level', 'warning',
+        ]
+    else:
+        cmd = [
+            sys.executable, '-m', 'flask', '--app', 'flask_app', 'run',
+            '--host', '127.0.0.1', '--port', str(port), '--no-reload', '--no-debugger',
+        ]
+    return subprocess.Popen(
+        cmd,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=log,
+    )
+
+
+def wait_until_healthy(base_url: str, proc: Optional[subprocess.Popen], timeout: float) -> None:
+    """Poll /health until the service answers or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f'Server exited early with code {proc.returncode}')
+        try:
+            with urllib.request.urlopen(base_url + '/health', timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except (http.client.HTTPException, OSError):
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f'Server did not become healthy within {timeout:.0f}s')
+
+
+def wait_for_workers(proc: subprocess.Popen, workers: int, timeout: float) -> None:
+    """Wait until the gunicorn master has forked the requested number of workers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'Server exited early with code {proc.returncode}')
+        if len(_child_pids(proc.pid)) >= workers:
+            return
+        time.sleep(0.25)
+    raise RuntimeError(f'Server did not start {workers} workers within {timeout:.0f}s')
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    """Terminate the server process and wait for it to exit."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Return the direct children of a process by scanning /proc."""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after the closing paren
+        fields = stat[stat.rfind(')') + 2:].split()
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _rss_kb(pid: int) -> Optional[int]:
+    """Return the resident set size of a process in kB, or None if it is gone."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class RSSSampler(threading.Thread):
+    """
+    Background thread recording the peak RSS of every server worker process.
+    Under gunicorn the workers are the children of the master; the development
+    server is a single process and is sampled directly.
+    """
+
+    def __init__(self, server_pid: int, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.server_pid = server_pid
+        self.interval = interval
+        self.peaks: Dict[int, int] = {}
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        pids = _child_pids(self.server_pid) or [self.server_pid]
+        for pid in pids:
+            rss = _rss_kb(pid)
+            if rss is not None:
+                self.peaks[pid] = max(rss, self.peaks.get(pid, 0))
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> Dict[int, int]:
+        self._stop_event.set()
+        self.join()
+        self.sample()
+        return dict(self.peaks)
+
+
+def _error_label(reason: Any) -> str:
+    """Short label for a failed request, used to group errors in the report."""
+    if isinstance(reason, TimeoutError):
+        return 'timeout'
+    if isinstance(reason, BaseException):
+        return type(reason).__name__
+    return str(reason)
+
+
+def send_request(base_url: str, path: str, encoding: str, transcript: str,
+                 timeout: float) -> Dict[str, Any]:
+    """Send a single request and return its status and latency."""
+    if encoding == 'form':
+        data = urllib.parse.urlencode({'transcript': transcript}).encode()
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    else:
+        data = json.dumps({'transcript': transcript}).encode()
+        headers = {'Content-Type': 'application/json'}
+    req = urllib.request.Request(base_url + path, data=data, headers=headers, method='POST')
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+        error = None
+    except urllib.error.HTTPError as e:
+        status = e.code
+        error = f'HTTP {e.code}'
+    except urllib.error.URLError as e:
+        status = None
+        error = _error_label(e.reason)
+    except (http.client.HTTPException, OSError) as e:
+        # Truncated or malformed responses and dropped connections under overload
+        status = None
+        error = _error_label(e)
+    return {
+        'path': path,
+        'status': status,
+        'error': error,
+        'latency': time.perf_counter() - start,
+    }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _latency_summary(sorted_latencies: List[float]) -> Dict[str, float]:
+    """Percentiles and maximum of sorted latencies in seconds, reported in ms."""
+    return {
+        'p50': _percentile(sorted_latencies, 50) * 1000,
+        'p90': _percentile(sorted_latencies, 90) * 1000,
+        'p99': _percentile(sorted_latencies, 99) * 1000,
+        'max': (sorted_latencies[-1] if sorted_latencies else 0.0) * 1000,
+    }
+
+
+def run_level(base_url: str, concurrency: int, total_requests: int,
+              transcripts: List[str], rng: random.Random, timeout: float,
+              server_pid: Optional[int]) -> Dict[str, Any]:
+    """Drive the service at one concurrency level and summarise the results."""
+    jobs = [(rng.choice(ENDPOINTS), rng.choice(transcripts)) for _ in range(total_requests)]
+    sampler = RSSSampler(server_pid) if server_pid is not None else None
+    if sampler is not None:
+        sampler.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda job: send_request(base_url, job[0][0], job[0][1], job[1], timeout),
+            jobs,
+        ))
+    elapsed = time.perf_counter() - start
+
+    rss_peaks = sampler.stop() if sampler is not None else {}
+    # Failed attempts (timeouts, resets, 5xx) count towards latency, so the
+    # curve does not improve as the service starts failing under overload
+    latencies = sorted(r['latency'] for r in results)
+    success_latencies = sorted(r['latency'] for r in results if r['error'] is None)
+    errors = [r for r in results if r['error'] is not None]
+
+    errors_by_endpoint: Dict[str, int] = {}
+    errors_by_type: Dict[str, int] = {}
+    for r in errors:
+        errors_by_endpoint[r['path']] = errors_by_endpoint.get(r['path'], 0) + 1
+        errors_by_type[r['error']] = errors_by_type.get(r['error'], 0) + 1
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(results),
+        'errors': len(errors),
+        'error_rate': len(errors) / len(results) if results else 0.0,
+        'errors_by_endpoint': errors_by_endpoint,
+        'errors_by_type': errors_by_type,
+        'duration_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'success_rps': len(success_latencies) / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': _latency_summary(latencies),
+        'success_latency_ms': _latency_summary(success_latencies),
+        'worker_rss_mb': {str(pid): kb / 1024 for pid, kb in sorted(rss_peaks.items())},
+    }
+
+
+def print_report(levels: List[Dict[str, Any]]) -> None:
+    """
+    Print the throughput/latency curve as a table. rps and the latency
+    columns cover every attempt, failed or not; ok rps counts successes only.
+    """
+    print("=" * 105)
+    print("LOAD TEST RESULTS")
+    print("=" * 105)
+    print(f"{'conc':>5} {'reqs':>6} {'err%':>6} {'rps':>8} {'ok rps':>8} {'p50 ms':>9} "
+          f"{'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  worker RSS MB (peak)")
+    for level in levels:
+        lat = level['latency_ms']
+        rss = ', '.join(f"{mb:.0f}" for mb in level['worker_rss_mb'].values()) or '-'
+        print(f"{level['concurrency']:>5} {level['requests']:>6} "
+              f"{level['error_rate'] * 100:>5.1f}% {level['throughput_rps']:>8.1f} "
+              f"{level['success_rps']:>8.1f} "
+              f"{lat['p50']:>9.1f} {lat['p90']:>9.1f} {lat['p99']:>9.1f} {lat['max']:>9.1f}  {rss}")
+        for path, count in sorted(level['errors_by_endpoint'].items()):
+            print(f"{'':>5} errors on {path}: {count}")
+        for label, count in sorted(level['errors_by_type'].items()):
+            print(f"{'':>5} {label}: {count}")
+    print("=" * 105)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for integers greater than zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid integer: {value!r}')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1: {value!r}')
+    return number
+
+
+def _concurrency_levels(value: str) -> List[int]:
+    """argparse type for a comma-separated list of positive integers."""
+    levels = [_positive_int(c.strip()) for c in value.split(',') if c.strip()]
+    if not levels:
+        raise argparse.ArgumentTypeError('at least one concurrency level is required')
+    return levels
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--server', choices=['gunicorn', 'flask'], default='gunicorn',
+                        help='How to start flask_app:app (default: gunicorn, as in render.yaml)')
+    parser.add_argument('--workers', type=_positive_int,
+                        help='Number of gunicorn workers (default: 1)')
+    parser.add_argument('--concurrency', type=_concurrency_levels, default='1,2,4,8',
+                        help='Comma-separated client concurrency levels (default: 1,2,4,8)')
+    parser.add_argument('--requests', type=_positive_int, default=200,
+                        help='Requests sent at each concurrency level (default: 200)')
+    parser.add_argument('--transcripts', type=_positive_int, default=50,
+                        help='Size of the synthetic transcript pool (default: 50)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for transcripts and request mix (default: 0)')
+    parser.add_argument('--port', type=int, default=0,
+                        help='Port for the local server (default: a free port)')
+    parser.add_argument('--url',
+                        help='Target an already running service instead of starting one')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Per-request timeout in seconds (default: 30)')
+    parser.add_argument('--startup-timeout', type=float, default=120.0,
+                        help='Seconds to wait for the server to become healthy (default: 120)')
+    parser.add_argument('--json', metavar='PATH',
+                        help='Also write the full results as JSON to PATH')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        parts = urllib.parse.urlsplit(args.url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            parser.error(f'--url must be an http:// or https:// URL, got {args.url!r}')
+
+    if args.workers is not None and (args.url or args.server != 'gunicorn'):
+        parser.error('--workers only applies when the harness starts gunicorn')
+    if args.url:
+        args.workers = None
+    elif args.workers is None:
+        # The development server is a single process
+        args.workers = 1
+    return args
+
+
+def warm_up(base_url: str, transcript: str, workers: int, timeout: float) -> None:
+    """
+    Send each route enough concurrent requests to reach every worker, so the
+    per-worker NLTK loading on first use is not counted in the first level.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, encoding in ENDPOINTS:
+            list(pool.map(
+                lambda _: send_request(base_url, path, encoding, transcript, timeout),
+                range(workers * 2),
+            ))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the load test and print the report."""
+    args = parse_args(argv)
+
+    generator = TranscriptGenerator(args.seed)
+    transcripts = generator.mix(args.transcripts)
+    rng = random.Random(args.seed)
+
+    proc = None
+    server_log = tempfile.TemporaryFile()
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        port = args.port or _free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        proc = start_server(args.server, args.workers, port, server_log)
+
+    try:
+        try:
+            wait_until_healthy(base_url, proc, args.startup_timeout)
+            if proc is not None and args.server == 'gunicorn':
+                wait_for_workers(proc, args.workers, args.startup_timeout)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            server_log.seek(0)
+            output = server_log.read().decode(errors='replace').strip()
+            if output:
+                print("Server output:", file=sys.stderr)
+                print(output, file=sys.stderr)
+            return 2
+
+        warm_up(base_url, transcripts[0], args.workers or 1, args.startup_timeout)
+
+        results = []
+        for concurrency in args.concurrency:
+            print(f"Running {args.requests} requests at concurrency {concurrency}...")
+            results.append(run_level(
+                base_url, concurrency, args.requests, transcripts, rng,
+                args.timeout, proc.pid if proc is not None else None,
+            ))
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        server_log.close()
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'server': 'external' if args.url else args.server,
+                'workers': args.workers,
+                'seed': args.seed,
+                'levels': results,
+            }, f, indent=2)
+
+    return 1 if any(level['errors'] for level in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
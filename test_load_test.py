@@ -0,0 +1,117 @@
+"""
+Tests for the load-testing harness that do not need a running server.
+"""
+
+import http.client
+import random
+import socket
+import urllib.error
+
+import pytest
+
+import load_test
+
+
+def test_percentile_nearest_rank():
+    values = [1, 2, 3, 4, 5]
+    assert load_test._percentile(values, 50) == 3
+    assert load_test._percentile(values, 90) == 5
+    assert load_test._percentile(values, 99) == 5
+    assert load_test._percentile(values, 1) == 1
+    assert load_test._percentile([], 50) == 0.0
+
+
+def test_transcript_generator_is_deterministic():
+    first = load_test.TranscriptGenerator(7).mix(5)
+    second = load_test.TranscriptGenerator(7).mix(5)
+    assert first == second
+    assert len(first) == 5
+
+
+def test_transcript_generator_speaker_format():
+    transcript = load_test.TranscriptGenerator(1).generate(5)
+    lines = [line for line in transcript.split('\n') if line.strip()]
+    assert all(line.startswith(('Physician:', 'Patient:')) for line in lines)
+    # Five exchanges plus the physician's closing remark
+    assert sum(line.startswith('Physician:') for line in lines) == 6
+    assert sum(line.startswith('Patient:') for line in lines) == 5
+
+
+def test_transcript_generator_parses():
+    pytest.importorskip('nltk')
+    from physician_notetaker import PhysicianNotetaker
+
+    transcript = load_test.TranscriptGenerator(1).generate(5)
+    parsed = PhysicianNotetaker().parse_transcript(transcript)
+    assert len(parsed['physician']) == 6
+    assert len(parsed['patient']) == 5
+
+
+def test_run_level_aggregates_results(monkeypatch):
+    def fake_send_request(base_url, path, encoding, transcript, timeout):
+        if path == '/api/soap-note':
+            return {'path': path, 'status': 500, 'error': 'HTTP 500', 'latency': 0.5}
+        return {'path': path, 'status': 200, 'error': None, 'latency': 0.01}
+
+    monkeypatch.setattr(load_test, 'send_request', fake_send_request)
+    result = load_test.run_level(
+        'http://localhost', 2, 40, ['Patient: hi'], random.Random(0), 1.0, None,
+    )
+
+    # Seed 0 sends 7 of the 40 requests to /api/soap-note
+    assert result['requests'] == 40
+    assert result['errors'] == 7
+    assert result['errors_by_endpoint'] == {'/api/soap-note': 7}
+    assert result['errors_by_type'] == {'HTTP 500': 7}
+    assert result['error_rate'] == pytest.approx(0.175)
+    assert result['throughput_rps'] == pytest.approx(40 / result['duration_s'])
+    assert result['success_rps'] == pytest.approx(33 / result['duration_s'])
+    # Failed attempts are included in the overall latency percentiles
+    assert result['latency_ms']['p50'] == pytest.approx(10.0)
+    assert result['latency_ms']['p90'] == pytest.approx(500.0)
+    assert result['latency_ms']['max'] == pytest.approx(500.0)
+    assert result['success_latency_ms']['p90'] == pytest.approx(10.0)
+    assert result['success_latency_ms']['max'] == pytest.approx(10.0)
+    assert result['worker_rss_mb'] == {}
+
+
+@pytest.mark.parametrize('exc, label', [
+    (http.client.IncompleteRead(b''), 'IncompleteRead'),
+    (http.client.BadStatusLine('x'), 'BadStatusLine'),
+    (ConnectionResetError(), 'ConnectionResetError'),
+    (urllib.error.URLError(socket.timeout()), 'timeout'),
+    (urllib.error.URLError(ConnectionRefusedError()), 'ConnectionRefusedError'),
+])
+def test_send_request_records_failures(monkeypatch, exc, label):
+    def fail(*args, **kwargs):
+        raise exc
+
+    monkeypatch.setattr(load_test.urllib.request, 'urlopen', fail)
+    result = load_test.send_request('http://localhost', '/process', 'form', 'x', 1.0)
+    assert result['status'] is None
+    assert result['error'] == label
+
+
+def test_parse_args_defaults():
+    args = load_test.parse_args([])
+    assert args.concurrency == [1, 2, 4, 8]
+    assert args.workers == 1
+    assert load_test.parse_args(['--url', 'http://localhost:5000']).workers is None
+
+
+@pytest.mark.parametrize('argv', [
+    ['--concurrency', '0'],
+    ['--concurrency', 'a'],
+    ['--concurrency', ','],
+    ['--transcripts', '0'],
+    ['--requests', '-1'],
+    ['--workers', '0'],
+    ['--server', 'flask', '--workers', '2'],
+    ['--url', 'http://localhost:5000', '--workers', '2'],
+    ['--url', '127.0.0.1:18765'],
+    ['--url', 'ftp://localhost:5000'],
+    ['--url', 'http://'],
+])
+def test_parse_args_rejects_invalid(argv):
+    with pytest.raises(SystemExit):
+        load_test.parse_args(argv)